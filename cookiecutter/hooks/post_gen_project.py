@@ -7,30 +7,30 @@ This module contains post-generation hooks to adjust the generated project to th
 different types of projects and do some final checks and configuration.
 """
 
-import configparser as _configparser
 import dataclasses as _dataclasses
 import json as _json
+import os as _os
 import pathlib as _pathlib
-import shutil as _shutil
+import shlex as _shlex
 import subprocess as _subprocess
-from collections import namedtuple
+import sys as _sys
+import types as _types
+from collections.abc import Callable
 from typing import Any
 
 
-def to_named_tuple(dictionary: dict[Any, Any], /) -> Any:
-    """Convert a dictionary to a named tuple.
+def to_namespace(dictionary: dict[Any, Any], /) -> Any:
+    """Convert a dictionary to a namespace.
 
     Args:
         dictionary: The dictionary to convert.
 
     Returns:
-        The named tuple with the same keys and values as the dictionary.
+        The namespace with the same keys and values as the dictionary.
     """
-    filtered = {k: v for k, v in dictionary.items() if not k.startswith("_")}
-    return namedtuple("Cookiecutter", filtered.keys())(*filtered.values())
-
-
-cookiecutter = to_named_tuple(_json.loads("""{{cookiecutter | tojson}}"""))
+    return _types.SimpleNamespace(
+        **{k: v for k, v in dictionary.items() if not k.startswith("_")}
+    )
 
 
 def main() -> None:
@@ -39,144 +39,274 @@ def main() -> None:
     This function is called after the project has been generated and it performs
     some fixes for different types of projects and some sanity checks.
     """
-    finish_setup()
-
-    print()
-    print("-" * 80)
-    print()
-    success(f"Your 🍪 {cookiecutter.github_repo_name} has been cut!")
-    print()
-    print_generated_tree()
-    print("Here is a list of things that should be reviewed and fixed:")
-    print_todos()
-    print()
-    print(
+    cookiecutter = to_namespace(_json.loads("""{{cookiecutter | tojson}}"""))
+    repo_name = cookiecutter.github_repo_name
+
+    finish_setup(cookiecutter)
+
+    # The whole banner is collected in a list of lines and written in one go to
+    # avoid one stdout lock/flush cycle per print() call
+    lines: list[str] = [
+        "",
+        "-" * 80,
+        "",
+        success(f"Your 🍪 {repo_name} has been cut!"),
+        "",
+    ]
+    if tree := get_generated_tree():
+        lines.append(tree.rstrip("\n"))
+        lines.append("")
+    lines.append("Here is a list of things that should be reviewed and fixed:")
+    lines.extend(get_todos(cookiecutter))
+    lines.append("")
+    lines.append(
         "After completing it you can amend the previous commit using `git commit "
         "--amend` or create a new commit for the changes using `git commit`."
     )
-    print()
-    print(
+    lines.append("")
+    lines.append(
         "You can make sure linting and tests pass by creating a virtual "
         "environment, installing the development dependencies and running `nox`:"
     )
-    print()
-    print(f"cd {cookiecutter.github_repo_name}")
-    print("python3 -m venv .venv")
-    print(". .venv/bin/activate")
-    print("pip install .[dev-noxfile]")
-    print("nox")
-    print()
-    if warnings := do_sanity_checks():
-        for warning in warnings:
-            warn(warning)
-        print()
-    note(
-        "If you had any issues or find any errors in the generated files, "
-        "please report them!"
+    lines.append("")
+    lines.append(f"cd {repo_name}")
+    lines.append("python3 -m venv .venv")
+    lines.append(". .venv/bin/activate")
+    lines.append("pip install .[dev-noxfile]")
+    lines.append("nox")
+    lines.append("")
+    if warnings := do_sanity_checks(cookiecutter):
+        lines.extend(warn(warning) for warning in warnings)
+        lines.append("")
+    lines.append(
+        note(
+            "If you had any issues or find any errors in the generated files, "
+            "please report them!"
+        )
     )
-    note("https://github.com/frequenz-floss/frequenz-repo-config-python/issues/new")
-    print()
+    lines.append(
+        note("https://github.com/frequenz-floss/frequenz-repo-config-python/issues/new")
+    )
+    lines.append("")
+    _sys.stdout.write("\n".join(lines) + "\n")
+    _sys.stdout.flush()
 
 
-def finish_setup() -> None:
+def finish_setup(cookiecutter: Any) -> None:
     """Finish the setup.
 
     This function is called after the project has been generated and can be used
     to perform any additional setup steps that are required for the project.
+
+    All the needed git commands are batched into one single shell pipeline to
+    avoid spawning one subprocess per command.  If the pipeline fails, the
+    commands are retried one by one to give more detailed error messages.
+
+    Args:
+        cookiecutter: The cookiecutter context of the generated project.
     """
-    was_repo_initialized = initialize_git_repo()
+    # One scandir() pass replaces the individual stat() calls for the `.git`
+    # and `.gitmodules` existence checks
+    entries = {entry.name: entry for entry in _os.scandir(".")}
+    was_repo_initialized = ".git" not in entries
+
+    if handler := _SETUP_DISPATCH.get(cookiecutter.type):
+        handler(cookiecutter)
+
+    submodules = parse_git_submodules(entries.get(".gitmodules"))
 
-    remove_unneeded_files()
+    steps: list[list[str]] = []
+    if was_repo_initialized:
+        steps.append(["git", "init"])
+    steps.extend(removal_steps(cookiecutter))
+    for submodule in submodules:
+        steps.append(
+            [
+                "git",
+                "submodule",
+                "add",
+                "--name",
+                submodule.name,
+                submodule.url,
+                submodule.path,
+            ]
+        )
+    steps.append(["git", "add", "."])
+    message = (
+        "Initial commit"
+        if was_repo_initialized
+        else "Regenerate repository using repo-config"
+    )
+    steps.append(["git", "commit", "-s", "-m", message])
+    if was_repo_initialized:
+        # Pack the loose objects created by the initial commit so follow-up git
+        # commands don't have to scan the loose-object directory
+        steps.append(["git", "gc", "--auto", "--quiet"])
 
-    match cookiecutter.type:
-        case "actor":
-            finish_actor_setup()
-        case "api":
-            finish_api_setup()
-        case "app":
-            finish_app_setup()
-        case "lib":
-            finish_lib_setup()
-        case "model":
-            finish_model_setup()
+    print()
+    if was_repo_initialized:
+        print(note("Initializing git repository..."))
+    if submodules:
+        print(note("Initializing git submodules..."))
 
-    initialize_git_submodules()
-    commit_git_changes(first_commit=was_repo_initialized)
+    if _run_git_pipeline(steps) != 0:
+        initialize_git_repo()
+        remove_unneeded_files(cookiecutter)
+        initialize_git_submodules(submodules)
+        commit_git_changes(first_commit=was_repo_initialized)
 
 
-def initialize_git_submodules() -> bool:
-    """Initialize git submodules.
+def _run_git_pipeline(steps: list[list[str]]) -> int:
+    """Run a sequence of commands as one shell pipeline.
 
-    If a `.gitmodules` file exists and it is not empty, it will be used to initialize
-    the git submodules using `git submodule update --init --recursive`.
+    The commands are shell-escaped, joined with `&&` and run in a single `bash`
+    process, so only one subprocess is spawned for the whole sequence.
+
+    Args:
+        steps: The commands to run.
+
+    Returns:
+        The status code of the pipeline (the status code of the first failing
+        command, or 0 if all commands succeeded).
+    """
+    script = " && ".join(_shlex.join(step) for step in steps)
+    print(f"Executing: {script}")
+    try:
+        result = _subprocess.run(["/bin/bash", "-c", script], check=False)
+    except OSError:
+        return -1
+    return result.returncode
+
+
+@_dataclasses.dataclass(frozen=True)
+class Submodule:
+    """A git submodule."""
+
+    name: str
+    path: str
+    url: str
+
+
+def parse_git_submodules(
+    gitmodules_entry: _os.DirEntry[str] | None,
+) -> list[Submodule]:
+    """Parse the `.gitmodules` file.
 
     If an empty `.gitmodules` file exists, it will be deleted.
 
+    Args:
+        gitmodules_entry: The directory entry for the `.gitmodules` file, or
+            `None` if there is no such file.
+
     Returns:
-        Whether any git submodules were initialized.
+        The git submodules declared in the `.gitmodules` file.
     """
-    gitmodules_path = _pathlib.Path(".gitmodules")
+    if gitmodules_entry is None:
+        return []
 
-    if not gitmodules_path.exists():
-        return False
+    # DirEntry.is_file() uses the type cached by scandir(), avoiding a stat()
+    if not gitmodules_entry.is_file():
+        print(warn("`.gitmodules` exists but is not a file! Ignoring..."))
+        return []
 
-    if not gitmodules_path.is_file():
-        warn("`.gitmodules` exists but is not a file! Ignoring...")
-        return False
+    gitmodules_path = _pathlib.Path(gitmodules_entry.path)
 
     if is_file_empty(gitmodules_path):
         gitmodules_path.unlink()
-        return False
+        return []
 
-    gitmodules_config = _configparser.ConfigParser()
-    with gitmodules_path.open("r", encoding="utf8") as file_handle:
-        gitmodules_config.read_file(file_handle)
+    submodules = _parse_gitmodules(gitmodules_path)
 
-    @_dataclasses.dataclass(frozen=True)
-    class Submodule:
-        """A git submodule."""
+    if not submodules:
+        print(warn("`.gitmodules` does not contain any valid submodules! Ignoring..."))
 
-        name: str
-        path: str
-        url: str
+    return submodules
 
-        def mkdir(self) -> None:
-            """Create the directory for the submodule."""
-            _pathlib.Path(self.path).parent.mkdir(exist_ok=True, parents=True)
 
-    submodules: list[Submodule] = []
-    for section in gitmodules_config.sections():
-        heading = 'submodule "'
-        trailing = '"'
-        if not section.startswith(heading) or not section.endswith(trailing):
-            warn(f"Can't parse `.gitmodules` section `{section}`! Ignoring...")
+def _parse_gitmodules(gitmodules_path: _pathlib.Path) -> list[Submodule]:
+    """Parse a `.gitmodules` file using git's own configuration parser.
+
+    `git config --list -z` emits the submodule entries as NUL-delimited,
+    newline-separated key/value records, so all the quoting and escaping edge
+    cases are handled by git's C code and only one pass over the output is
+    needed here.
+
+    Args:
+        gitmodules_path: The path to the `.gitmodules` file to parse.
+
+    Returns:
+        The git submodules declared in the file.
+    """
+    try:
+        result = _subprocess.run(
+            ["git", "config", "--file", str(gitmodules_path), "--list", "-z"],
+            check=False,
+            capture_output=True,
+        )
+    except OSError as exc:
+        print(warn(f"Failed to parse `.gitmodules`: {exc}! Ignoring..."))
+        return []
+    if result.returncode != 0:
+        print(warn("Can't parse `.gitmodules`! Ignoring..."))
+        return []
+
+    prefix = "submodule."
+    entries_by_name: dict[str, dict[str, str]] = {}
+    warned_sections: set[str] = set()
+    for record in result.stdout.split(b"\0"):
+        if b"\n" not in record:
             continue
-        if "path" not in gitmodules_config[section]:
-            warn(
-                f"`.gitmodules` contains section `{section}` without `path`! Ignoring..."
+        key, value = record.decode(errors="replace").split("\n", 1)
+        section, _, option = key.rpartition(".")
+        if section.startswith(prefix):
+            entries_by_name.setdefault(section[len(prefix) :], {})[option] = value
+        elif section not in warned_sections:
+            warned_sections.add(section)
+            print(warn(f"Can't parse `.gitmodules` section `{section}`! Ignoring..."))
+
+    submodules: list[Submodule] = []
+    for name, entries in entries_by_name.items():
+        section = f'submodule "{name}"'
+        if "path" not in entries:
+            print(
+                warn(
+                    f"`.gitmodules` contains section `{section}` without `path`!"
+                    " Ignoring..."
+                )
             )
             continue
-        if "url" not in gitmodules_config[section]:
-            warn(
-                f"`.gitmodules` contains section `{section}` without `url`! Ignoring..."
+        if "url" not in entries:
+            print(
+                warn(
+                    f"`.gitmodules` contains section `{section}` without `url`!"
+                    " Ignoring..."
+                )
             )
             continue
-        submodule = Submodule(
-            name=section[len(heading) : -len(trailing)],
-            path=gitmodules_config[section]["path"],
-            url=gitmodules_config[section]["url"],
+        submodules.append(
+            Submodule(name=name, path=entries["path"], url=entries["url"])
         )
-        # submodule.mkdir()
-        submodules.append(submodule)
 
-    if not submodules:
-        warn("`.gitmodules` does not contain any valid submodules! Ignoring...")
-        return False
+    return submodules
 
-    print()
-    note("Initializing git submodules...")
 
+def initialize_git_submodules(submodules: list[Submodule]) -> None:
+    """Initialize git submodules one command at a time.
+
+    This is the fallback used when batching the submodule initialization into
+    one pipeline failed, to give more detailed error messages.  Submodules that
+    were already added by a partially successful pipeline are skipped, since
+    `git submodule add` is not idempotent and would fail on them.
+
+    Args:
+        submodules: The submodules to initialize.
+    """
     for submodule in submodules:
+        status = try_run(
+            ["git", "submodule", "status", "--", submodule.path], capture=True
+        )
+        if status is not None and status.returncode == 0:
+            continue
         try_run(
             [
                 "git",
@@ -192,14 +322,6 @@ def initialize_git_submodules() -> bool:
             warn_on_bad_status=f"Failed to add submodule `{submodule.name}`!",
             note_on_failure=f"Please add submodule `{submodule.name}` manually.",
         )
-    try_run(
-        ["git", "submodule", "update", "--init"],
-        verbose=True,
-        warn_on_error=True,
-        warn_on_bad_status="Failed to initialize git submodules!",
-        note_on_failure="Please initialize git submodules manually.",
-    )
-    return True
 
 
 def initialize_git_repo() -> bool:
@@ -216,7 +338,7 @@ def initialize_git_repo() -> bool:
     if _pathlib.Path(".git").exists():
         return False
     print()
-    note("Initializing git repository...")
+    print(note("Initializing git repository..."))
     try_run(
         ["git", "init"],
         verbose=True,
@@ -235,39 +357,83 @@ def commit_git_changes(*, first_commit: bool) -> None:
     Args:
         first_commit: Whether this is the first commit in the git repository.
     """
-    if not try_run(["git", "status", "--porcelain"]):
+    try:
+        result = _subprocess.run(
+            ["git", "status", "--porcelain", "-z"], check=False, capture_output=True
+        )
+    except OSError:
+        return
+    if not result.stdout:
         return
 
     print()
-    try_run(
-        ["git", "add", "."],
-        verbose=True,
-        warn_on_error=True,
-        warn_on_bad_status="Failed to add all changes to the git repository!",
-        note_on_failure="Please add all changes to the git repository manually.",
-    )
     message = (
         "Initial commit" if first_commit else "Regenerate repository using repo-config"
     )
-    try_run(
-        ["git", "commit", "-s", "-m", message],
-        verbose=True,
-        warn_on_error=True,
-        warn_on_bad_status="Failed to commit all changes to the git repository!",
-        note_on_failure="Please commit all changes to the git repository manually.",
-    )
+    steps = [["git", "add", "."], ["git", "commit", "-s", "-m", message]]
+    if first_commit:
+        # Pack the loose objects created by the initial commit so follow-up git
+        # commands don't have to scan the loose-object directory
+        steps.append(["git", "gc", "--auto", "--quiet"])
+    if _run_git_pipeline(steps) != 0:
+        try_run(
+            ["git", "add", "."],
+            verbose=True,
+            warn_on_error=True,
+            warn_on_bad_status="Failed to add all changes to the git repository!",
+            note_on_failure="Please add all changes to the git repository manually.",
+        )
+        try_run(
+            ["git", "commit", "-s", "-m", message],
+            verbose=True,
+            warn_on_error=True,
+            warn_on_bad_status="Failed to commit all changes to the git repository!",
+            note_on_failure="Please commit all changes to the git repository manually.",
+        )
+
 
+def removal_steps(cookiecutter: Any) -> list[list[str]]:
+    """Get the commands removing the files that are not needed for the project.
 
-def remove_unneeded_files() -> None:
-    """Remove unneeded files.
+    The removals are run inside the batched shell pipeline, before `git add .`,
+    so the files never have to be staged and no Python-level directory
+    traversal is needed.
 
-    Files that are not needed for the project are removed.
+    Args:
+        cookiecutter: The cookiecutter context of the generated project.
+
+    Returns:
+        The removal commands to run.
     """
+    steps: list[list[str]] = []
+
     if cookiecutter.license != "MIT":
-        _pathlib.Path("LICENSE").unlink()
+        steps.append(["rm", "-f", "--", "LICENSE"])
 
     if cookiecutter.type != "api":
-        _shutil.rmtree("proto")
+        steps.append(["rm", "-r", "-f", "--", "proto"])
+
+    return steps
+
+
+def remove_unneeded_files(cookiecutter: Any) -> None:
+    """Remove unneeded files one command at a time.
+
+    This is the fallback used when batching the removals into one pipeline
+    failed, to give more detailed error messages.  The commands are idempotent,
+    so it is safe to run them again even if the pipeline partially succeeded.
+
+    Args:
+        cookiecutter: The cookiecutter context of the generated project.
+    """
+    for step in removal_steps(cookiecutter):
+        try_run(
+            step,
+            verbose=True,
+            warn_on_error=True,
+            warn_on_bad_status=f"Failed to remove `{step[-1]}`!",
+            note_on_failure=f"Please remove `{step[-1]}` manually.",
+        )
 
 
 def is_file_empty(path: _pathlib.Path) -> bool:
@@ -286,34 +452,78 @@ def is_file_empty(path: _pathlib.Path) -> bool:
     Returns:
         True if the file has only white spaces, False otherwise.
     """
-    with path.open("r", encoding="utf8") as file_handle:
-        contents = file_handle.read(1024).strip()
-        return not contents
+    stat = path.stat()
+    if stat.st_size == 0:
+        return True
+    # Read in binary mode to avoid decoding bytes that are discarded anyway
+    with path.open("rb") as file_handle:
+        return not file_handle.read(min(1024, stat.st_size)).strip()
+
 
+def get_generated_tree() -> str | None:
+    """Get the generated files tree as reported by the `tree` command.
 
-def print_generated_tree() -> None:
-    """Print the generated files tree."""
-    result = try_run(["tree"])
+    Returns:
+        The output of the `tree` command, or `None` if it is not available or
+            failed.
+    """
+    # Deferred, only needed to probe for commands
+    import shutil as _shutil  # pylint: disable=import-outside-toplevel
+
+    # Checking the PATH is much cheaper than a fork+exec just to find out the
+    # command is not installed
+    if _shutil.which("tree") is None:
+        return None
+    result = try_run(["tree"], capture=True)
     if result is not None and result.returncode == 0:
-        print()
+        output: bytes = result.stdout
+        return output.decode(errors="replace")
+    return None
 
 
-def print_todos() -> None:
-    """Print all TODOs in the generated project."""
-    todo_str = "TODO(cookiecutter):"
-    repo = cookiecutter.github_repo_name
-    cmd = ["grep", "-r", "--color", rf"\<{todo_str}.*", "."]
-    try_run(
-        cmd,
-        warn_on_error=True,
-        warn_on_bad_status=f"No `{todo_str}` found using `{' '.join(cmd)}`",
-        note_on_failure=f"Please search for `{todo_str}` in `{repo}/` manually.",
-    )
+def get_todos(cookiecutter: Any) -> list[str]:
+    """Get the lines listing all TODOs in the generated project.
 
+    Args:
+        cookiecutter: The cookiecutter context of the generated project.
 
-def do_sanity_checks() -> list[str]:
+    Returns:
+        The lines to print, including any warnings if the search failed.
+    """
+    # Deferred, only needed to probe for commands
+    import shutil as _shutil  # pylint: disable=import-outside-toplevel
+
+    todo_str = "TODO(cookiecutter):"
+    repo = cookiecutter.github_repo_name
+    manual_note = note(f"Please search for `{todo_str}` in `{repo}/` manually.")
+    # Prefer git grep (skips .git and respects .gitignore) and ripgrep over a
+    # plain recursive grep, which also walks the .git directory
+    if _pathlib.Path(".git").exists() and _shutil.which("git") is not None:
+        cmd = ["git", "grep", "--no-color", "-n", "-I", "--untracked", "-e", todo_str]
+    elif _shutil.which("rg") is not None:
+        cmd = ["rg", "--no-heading", r"TODO\(cookiecutter\):"]
+    elif _shutil.which("grep") is not None:
+        cmd = ["grep", "-r", "--color", rf"\<{todo_str}.*", "."]
+    else:
+        return [manual_note]
+    try:
+        result = _subprocess.run(cmd, check=False, capture_output=True)
+    except OSError as exc:
+        return [
+            warn(f"Failed to run the search command `{_shlex.join(cmd)}`: {exc}"),
+            manual_note,
+        ]
+    if result.returncode != 0:
+        return [warn(f"No `{todo_str}` found using `{_shlex.join(cmd)}`"), manual_note]
+    return [result.stdout.decode(errors="replace").rstrip("\n")]
+
+
+def do_sanity_checks(cookiecutter: Any) -> list[str]:
     """Perform sanity checks on the generated project.
 
+    Args:
+        cookiecutter: The cookiecutter context of the generated project.
+
     Returns:
         List of warnings.
     """
@@ -327,15 +537,7 @@ def do_sanity_checks() -> list[str]:
     return warnings
 
 
-def finish_actor_setup() -> None:
-    """Finish the setup for an actor.
-
-    This function is called after the project has been generated and can be used
-    to perform any additional setup steps that are required for an actor.
-    """
-
-
-def finish_api_setup() -> None:
+def finish_api_setup(_cookiecutter: Any) -> None:
     """Finish the setup for an API.
 
     This function is called after the project has been generated and can be used
@@ -348,20 +550,16 @@ def finish_api_setup() -> None:
     * Create `submodules` folder
     * Create `.gitmodules` file
     * Initialize submodules
-    """
-    _pathlib.Path("src").rename("py")
-    _pathlib.Path("tests").rename("pytests")
-
 
-def finish_app_setup() -> None:
-    """Finish the setup for an app.
-
-    This function is called after the project has been generated and can be used
-    to perform any additional setup steps that are required for an app.
+    Args:
+        _cookiecutter: The cookiecutter context of the generated project (unused,
+            only taken to match the `_SETUP_DISPATCH` callable signature).
     """
+    _os.replace("src", "py")
+    _os.replace("tests", "pytests")
 
 
-def finish_lib_setup() -> None:
+def finish_lib_setup(cookiecutter: Any) -> None:
     """Finish the setup for a library.
 
     This function is called after the project has been generated and can be used
@@ -373,19 +571,24 @@ def finish_lib_setup() -> None:
 
       - `lib`: `src/frequenz/{name}`
       - `rest`: `src/frequenz/{type}/{name}`
+
+    Args:
+        cookiecutter: The cookiecutter context of the generated project.
     """
-    _pathlib.Path(f"src/frequenz/{cookiecutter.type}/{cookiecutter.name}").rename(
-        f"src/frequenz/{cookiecutter.name}"
-    )
-    _pathlib.Path(f"src/frequenz/{cookiecutter.type}").rmdir()
+    name = cookiecutter.name
+    src_dir = f"src/frequenz/{cookiecutter.type}"
+    _os.replace(f"{src_dir}/{name}", f"src/frequenz/{name}")
+    _os.rmdir(src_dir)
 
 
-def finish_model_setup() -> None:
-    """Finish the setup for a model.
+_SETUP_DISPATCH: dict[str, Callable[[Any], None]] = {
+    "api": finish_api_setup,
+    "lib": finish_lib_setup,
+}
+"""Type-specific setup steps, keyed by project type.
 
-    This function is called after the project has been generated and can be used
-    to perform any additional setup steps that are required for a model.
-    """
+Project types that don't need any extra setup steps are simply omitted.
+"""
 
 
 def try_run(
@@ -396,6 +599,7 @@ def try_run(
     warn_on_bad_status: str | None = None,
     note_on_failure: str | None = None,
     verbose: bool = False,
+    capture: bool = False,
 ) -> _subprocess.CompletedProcess[Any] | None:
     """Try to run a command.
 
@@ -409,6 +613,8 @@ def try_run(
         note_on_failure: If not `None`, print this note if the command fails (either
             because of an error or a non-zero status code).
         verbose: Whether to print the command before running it.
+        capture: Whether to capture the command's stdout and stderr instead of
+            letting them stream to the terminal.
 
     Returns:
         The result of the command or `None` if the command could not be run because
@@ -417,49 +623,58 @@ def try_run(
     result = None
     failed = False
     if verbose:
-        print(f"Executing: {' '.join(cmd)}")
+        print(f"Executing: {_shlex.join(cmd)}")
     try:
-        result = _subprocess.run(cmd, check=False)
+        result = _subprocess.run(cmd, check=False, capture_output=capture)
     except (OSError, _subprocess.CalledProcessError) as exc:
         if warn_on_error:
-            warn(f"Failed to run the search command `{' '.join(cmd)}`: {exc}")
+            print(warn(f"Failed to run the search command `{_shlex.join(cmd)}`: {exc}"))
         failed = True
     else:
         if result.returncode != 0:
             if warn_on_bad_status is not None:
-                warn(f"{warn_on_bad_status} (status code: {result.returncode})")
+                print(warn(f"{warn_on_bad_status} (status code: {result.returncode})"))
             failed = True
     if failed and note_on_failure is not None:
-        note(note_on_failure)
+        print(note(note_on_failure))
 
     return result
 
 
-def success(message: str) -> None:
-    """Print a success message.
+def success(message: str) -> str:
+    """Format a success message.
 
     Args:
-        message: The message to print.
+        message: The message to format.
+
+    Returns:
+        The ANSI-colored message.
     """
-    print(f"\033[32m{message}\033[0m")
+    return f"\033[32m{message}\033[0m"
 
 
-def note(message: str) -> None:
-    """Print a note.
+def note(message: str) -> str:
+    """Format a note.
 
     Args:
-        message: The message to print.
+        message: The message to format.
+
+    Returns:
+        The ANSI-colored message.
     """
-    print(f"\033[36m{message}\033[0m")
+    return f"\033[36m{message}\033[0m"
 
 
-def warn(message: str) -> None:
-    """Print a warning.
+def warn(message: str) -> str:
+    """Format a warning.
 
     Args:
-        message: The message to print.
+        message: The message to format.
+
+    Returns:
+        The ANSI-colored message.
     """
-    print(f"\033[33mWARNING: {message}\033[0m")
+    return f"\033[33mWARNING: {message}\033[0m"
 
 
 main()
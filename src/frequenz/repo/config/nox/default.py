@@ -18,16 +18,17 @@ command-line options for the same types of repositories, and the
 `common_command_options` variable is the default command-line options for all types of
 repositories.
 
-They can be modified before being passed to
-[`nox.configure()`][frequenz.repo.config.nox.configure] by using the
+The default configurations that don't diverge from the common ones are plain
+aliases of `common_config` and `common_command_options`, so they must be copied
+using the
 [`CommandsOptions.copy()`][frequenz.repo.config.nox.config.CommandsOptions.copy]
-method.
+method before being modified and passed to
+[`nox.configure()`][frequenz.repo.config.nox.configure].
 """
 
 import dataclasses
 
 from . import config as _config
-from . import util as _util
 
 common_command_options: _config.CommandsOptions = _config.CommandsOptions(
     black=[
@@ -77,14 +78,14 @@ common_config = _config.Config(
 )
 """Default configuration for all types of repositories."""
 
-actor_command_options: _config.CommandsOptions = common_command_options.copy()
-"""Default command-line options for actors."""
+actor_command_options: _config.CommandsOptions = common_command_options
+"""Default command-line options for actors (alias of `common_command_options`)."""
 
-actor_config: _config.Config = common_config.copy()
-"""Default configuration for actors."""
+actor_config: _config.Config = common_config
+"""Default configuration for actors (alias of `common_config`)."""
 
-api_command_options: _config.CommandsOptions = common_command_options.copy()
-"""Default command-line options for APIs."""
+api_command_options: _config.CommandsOptions = common_command_options
+"""Default command-line options for APIs (alias of `common_command_options`)."""
 
 api_config: _config.Config = dataclasses.replace(
     common_config,
@@ -92,7 +93,7 @@ api_config: _config.Config = dataclasses.replace(
     # We don't check the sources at all because they are automatically generated.
     source_paths=[],
     # We adapt the path to the tests.
-    extra_paths=list(_util.replace(common_config.extra_paths, {"tests": "pytests"})),
+    extra_paths=["pytests" if p == "tests" else p for p in common_config.extra_paths],
 )
 """Default configuration for APIs.
 
@@ -100,20 +101,20 @@ Same as `common_config`, but with `source_paths` replacing `"src"` with `"py"`
 and `extra_paths` replacing `"tests"` with `"pytests"`.
 """
 
-app_command_options: _config.CommandsOptions = common_command_options.copy()
-"""Default command-line options for applications."""
+app_command_options: _config.CommandsOptions = common_command_options
+"""Default command-line options for applications (alias of `common_command_options`)."""
 
-app_config: _config.Config = common_config.copy()
-"""Default configuration for applications."""
+app_config: _config.Config = common_config
+"""Default configuration for applications (alias of `common_config`)."""
 
-lib_command_options: _config.CommandsOptions = common_command_options.copy()
-"""Default command-line options for libraries."""
+lib_command_options: _config.CommandsOptions = common_command_options
+"""Default command-line options for libraries (alias of `common_command_options`)."""
 
-lib_config: _config.Config = common_config.copy()
-"""Default configuration for libraries."""
+lib_config: _config.Config = common_config
+"""Default configuration for libraries (alias of `common_config`)."""
 
-model_command_options: _config.CommandsOptions = common_command_options.copy()
-"""Default command-line options for models."""
+model_command_options: _config.CommandsOptions = common_command_options
+"""Default command-line options for models (alias of `common_command_options`)."""
 
-model_config: _config.Config = common_config.copy()
-"""Default configuration for models."""
+model_config: _config.Config = common_config
+"""Default configuration for models (alias of `common_config`)."""